@@ -1,11 +1,21 @@
 import os
+import sys
+import logging
+from logging.handlers import RotatingFileHandler
 import cv2
+import json
 import time
+import subprocess
 import requests
+from requests.adapters import HTTPAdapter
 import numpy as np
 import uuid
+import queue
 import threading
 import uvicorn
+import anyio.to_thread
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from fastapi import FastAPI, Request, Query
 from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,10 +24,37 @@ from ultralytics import YOLO
 import torch
 import supervision as sv
 
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from torchvision.io import encode_jpeg as nvjpeg_encode
+except ImportError:
+    nvjpeg_encode = None
+
+try:
+    import av
+except ImportError:
+    av = None
+
 # -----------------------------------------------------------------------
 # FASTAPI SETUP
 # -----------------------------------------------------------------------
-app = FastAPI(title="DroneGuard AI Backend")
+@asynccontextmanager
+async def lifespan(app):
+    # Sync generators run next() in anyio's threadpool (default 40 tokens),
+    # so many open MJPEG streams would otherwise queue behind each other
+    anyio.to_thread.current_default_thread_limiter().total_tokens = STREAM_THREAD_LIMIT
+    yield
+
+app = FastAPI(title="DroneGuard AI Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,51 +68,211 @@ app.add_middleware(
 # CONFIGURATION
 # -----------------------------------------------------------------------
 NODE_API = "http://127.0.0.1:4000/api/webhook/detection"
+JSON_HEADERS = {"Content-Type": "application/json"}
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CAPTURE_DIR = os.path.join(BASE_DIR, "public", "captures")
 os.makedirs(CAPTURE_DIR, exist_ok=True)
+LOG_PATH = os.path.join(BASE_DIR, "ai_engine.log")
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
 
 MODEL_PATH = "best_latest.pt"
+ENGINE_PATH = "best_latest.engine" # TensorRT FP16, built from MODEL_PATH on first GPU run
+INT8_ENGINE_PATH = "best_latest_int8.engine" # Used instead of ENGINE_PATH when USE_INT8=1
+USE_INT8 = os.getenv("USE_INT8") == "1"
+INT8_CALIB_IMAGES = 200 # Most recent alert captures used for INT8 calibration
+INT8_BUILD_SCRIPT = os.path.join(os.path.dirname(BASE_DIR), "scripts", "build_int8_engine.py")
+USE_TORCH_COMPILE = os.getenv("USE_TORCH_COMPILE") == "1" # PyTorch fallback only (no engine)
+USE_TENSORRT = True
+IMG_SIZE = 640
+COARSE_IMG_SIZE = 320 # Quiet-scene heartbeat pass; 4x fewer pixels than IMG_SIZE
+COARSE_CONFIDENCE = 0.15 # Low on purpose: any candidate escalates to a full IMG_SIZE pass
 CONFIDENCE = 0.35
 IOU_THRESH = 0.4
 SWAP_CLASSES = True
 
+# MJPEG Stream
+STREAM_FPS = 20
+STREAM_MAX_WIDTH = 960 # Larger sources are downscaled once in the reader
+STALE_TIMEOUT = 3.0
+STREAM_THREAD_LIMIT = 100 # Threadpool tokens; each open stream holds one while waiting for a frame
+MAX_SKIP_FACTOR = 8 # Adaptive throttling: decode at most every 8th stream tick
+MAX_DRAIN_GRABS = 4 # Extra grabs before retrieve() to flush frames the backend buffered
+JPEG_QUALITY = 80
+MJPEG_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+PPM_HEADER = b"--frame\r\nContent-Type: image/x-portable-pixmap\r\n\r\n"
+
+# Inference Batching (one model.predict for all cameras)
+INFER_BATCH_SIZE = 8
+INFER_BATCH_WAIT = 0.005 # Seconds to wait for other cameras to join a batch
+INFER_TIMEOUT = 5.0
+
+# Motion Gate (skip inference while the scene is static)
+MOTION_SIZE = (160, 90) # Grayscale thumbnail, made by the reader thread
+MOTION_THRESH = 2.0 # Mean abs pixel diff vs the last inferred frame
+MOTION_MAX_SKIP = 0.5 # Seconds; heartbeat, re-run at least at 2 Hz even if nothing moves
+
+# Alerts
+ALERT_COOLDOWN = 2.0 # Seconds between alerts per camera
+ALERT_QUEUE_SIZE = 32
+ALERT_WORKERS = 4
+CAPTURE_QUALITY = 75
+SAVE_QUEUE_SIZE = 32
+SAVE_TIMEOUT = 2.0 # Seconds an alert waits for its snapshot to reach disk
+
+# Logging: rotating file for the full record, console only for warnings and
+# errors, so stream and alert events never block on the terminal
+log = logging.getLogger("iomp")
+log.setLevel(logging.INFO)
+log.propagate = False
+_file_handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+_file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(threadName)s %(message)s"))
+_console_handler = logging.StreamHandler()
+_console_handler.setLevel(logging.WARNING)
+log.addHandler(_file_handler)
+log.addHandler(_console_handler)
+
 # -----------------------------------------------------------------------
 # GLOBAL STATE
 # -----------------------------------------------------------------------
-camera_sessions = {}
-active_streams = {} 
-stream_readers = {} 
-last_alert_time = {}
-
-# Global Lock
-reader_lock = threading.Lock()
+# __slots__ on the hot per-frame state where the interpreter supports it (3.10+)
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
+class CameraState:
+    # One per camera while anyone is watching it. Every /stream session of the
+    # camera subscribes here and shares one reader + inference pipeline.
+    name: str
+    source: str
+    reader: "ThreadedCamera | None" = None
+    pipeline: "threading.Thread | None" = None
+    subscribers: list = field(default_factory=list) # (queue, raw) per session; len() is the viewer refcount
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    last_alert: float = float("-inf") # time.monotonic() of the last alert
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+camera_states = {}
+camera_states_lock = threading.Lock() # Only for replacing a stopped camera's entry
+alert_queue = queue.Queue(maxsize=ALERT_QUEUE_SIZE)
+infer_queue = queue.Queue()
+save_queue = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+
+# Pooled keep-alive connections for the Node webhook (one host, few senders)
+ALERT_SESSION = requests.Session()
+ALERT_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 # Device Config
 DEVICE = 0 if torch.cuda.is_available() else "cpu"
-print(f"🚀 Using Device: {DEVICE}")
+log.info("🚀 Using Device: %s", DEVICE)
+
+# GPU JPEG encode (nvJPEG via torchvision), switched off on first failure
+USE_NVJPEG = DEVICE != "cpu" and nvjpeg_encode is not None
+
+# Coarse heartbeat pass, switched off on first failure (e.g. a fixed-shape engine)
+USE_COARSE_PASS = True
+
+# Built once, reused by every model.predict call
+PREDICT_KWARGS = dict(conf=CONFIDENCE, iou=IOU_THRESH, imgsz=IMG_SIZE, agnostic_nms=True, verbose=False, device=DEVICE)
+COARSE_PREDICT_KWARGS = dict(PREDICT_KWARGS, conf=COARSE_CONFIDENCE, imgsz=COARSE_IMG_SIZE)
 
 # -----------------------------------------------------------------------
 # MODEL LOADING
 # -----------------------------------------------------------------------
+def build_int8_engine():
+    # Calibration + export live in one place, the build script; it exports from
+    # a copy of the weights so the FP16 engine next to it is left alone
+    result = subprocess.run([
+        sys.executable, INT8_BUILD_SCRIPT,
+        "--model", os.path.abspath(MODEL_PATH), "--output", os.path.abspath(INT8_ENGINE_PATH),
+        "--captures", CAPTURE_DIR, "--images", str(INT8_CALIB_IMAGES), "--batch", str(INFER_BATCH_SIZE),
+    ], capture_output=True, text=True)
+    if result.returncode != 0:
+        # Surface the script's own reason (e.g. no captures yet), not just the exit code
+        output = (result.stderr or result.stdout).strip().splitlines()
+        raise RuntimeError(output[-1] if output else f"exit code {result.returncode}")
+
+def load_tensorrt_engine(pt_model):
+    # Engine batch matches the inference batcher; dynamic so partial batches still run
+    try:
+        engine_path = ENGINE_PATH
+        if USE_INT8:
+            # A fresh install has no captures to calibrate on: fall back to FP16
+            try:
+                if not os.path.exists(INT8_ENGINE_PATH):
+                    log.info("⚙️ Building TensorRT INT8 Engine (first run only)...")
+                    build_int8_engine()
+                engine_path = INT8_ENGINE_PATH
+            except Exception as e:
+                log.warning("⚠️ INT8 engine unavailable, using FP16: %s", e)
+        if not os.path.exists(engine_path):
+            log.info("⚙️ Building TensorRT FP16 Engine (first run only)...")
+            engine_path = pt_model.export(
+                format="engine", imgsz=IMG_SIZE, half=True, device=0,
+                dynamic=True, batch=INFER_BATCH_SIZE, workspace=4,
+            )
+        engine = YOLO(engine_path, task="detect")
+        log.info("⚡ TensorRT Engine Loaded: %s", engine_path)
+        return engine
+    except Exception as e:
+        log.warning("⚠️ TensorRT unavailable, using PyTorch: %s", e)
+        return pt_model
+
+def compile_pytorch_model(pt_model):
+    # Only for the PyTorch fallback: the engine already runs as one fused graph.
+    # The predictor wraps (and fuses) the network on first predict, so build it
+    # with a warm-up call and compile the wrapped network afterwards.
+    warmup = np.zeros((IMG_SIZE, IMG_SIZE, 3), np.uint8)
+    pt_model.predict(warmup, **PREDICT_KWARGS)
+    backend = pt_model.predictor.model
+    network = backend.model
+    try:
+        backend.model = torch.compile(network, mode="reduce-overhead")
+        pt_model.predict(warmup, **PREDICT_KWARGS) # compile + CUDA graph capture happen here
+        log.info("🧩 torch.compile enabled")
+    except Exception as e:
+        backend.model = network
+        log.warning("⚠️ torch.compile unavailable, using eager PyTorch: %s", e)
+
 try:
-    print(f"📥 Loading Model: {MODEL_PATH}")
+    log.info("📥 Loading Model: %s", MODEL_PATH)
     model = YOLO(MODEL_PATH)
     if DEVICE != "cpu":
         model.to("cuda")
     
     if SWAP_CLASSES:
         model.model.names = {0: "bird", 1: "drone"}
-        print(f"🔄 Classes Swapped: {model.model.names}")
+        log.info("🔄 Classes Swapped: %s", model.model.names)
     
+    # Taken from the .pt: an engine wrapper has no model.model.names until first predict
     CLASS_NAMES = model.model.names
-    print(f"✅ Model Loaded Successfully")
+
+    if DEVICE != "cpu" and USE_TENSORRT:
+        model = load_tensorrt_engine(model)
+    if DEVICE != "cpu" and USE_TORCH_COMPILE and isinstance(model.model, torch.nn.Module):
+        compile_pytorch_model(model)
+    log.info("✅ Model Loaded Successfully")
 except Exception as e:
-    print(f"❌ Error loading model: {e}")
+    log.error("❌ Error loading model: %s", e)
     model = None
     CLASS_NAMES = {}
 
-os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;udp|timeout;5000"
+# class_id -> name in a single fancy-index instead of a per-box dict lookup
+CLASS_NAME_TABLE = np.array(
+    [CLASS_NAMES.get(i, str(i)) for i in range(max(CLASS_NAMES, default=-1) + 1)], dtype=object
+)
+# Alerts only fire for this class; -1 (never matches) if the model has no drone class
+DRONE_CLASS_ID = next((i for i, name in CLASS_NAMES.items() if "drone" in name.lower()), -1)
+
+# CAP_PROP_BUFFERSIZE is ignored by the FFmpeg backend, so ask the demuxer directly
+os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;udp|fflags;nobuffer|flags;low_delay|timeout;5000"
+
+# Hardware decode for network streams (OpenCV >= 4.5.2 falls back to software if unavailable)
+HW_DECODE = hasattr(cv2, "CAP_PROP_HW_ACCELERATION")
+
+# Network streams go through PyAV (NVDEC on GPU hosts) when it is installed
+USE_PYAV = av is not None
+AV_OPTIONS = {"rtsp_transport": "udp", "fflags": "nobuffer", "flags": "low_delay"}
+AV_TIMEOUT = (5.0, 5.0) # (open, read) seconds; a dead stream raises into the reconnect path
 
 # -----------------------------------------------------------------------
 # PYDANTIC MODELS
@@ -83,6 +280,57 @@ os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;udp|timeout;5000"
 class TerminateRequest(BaseModel):
     cameraName: str
 
+# -----------------------------------------------------------------------
+# PYAV CAPTURE
+# -----------------------------------------------------------------------
+def av_hwaccel():
+    # PyAV >= 14: decode on NVDEC, frames are downloaded to host on to_ndarray()
+    if DEVICE == "cpu": return None
+    try:
+        from av.codec.hwaccel import HWAccel
+        return HWAccel(device_type="cuda", allow_software_fallback=True)
+    except Exception:
+        return None
+
+class AVCapture:
+    """The slice of the cv2.VideoCapture API that ThreadedCamera uses, backed by PyAV."""
+    def __init__(self, src):
+        hwaccel = av_hwaccel()
+        kwargs = {"hwaccel": hwaccel} if hwaccel else {}
+        self.container = av.open(src, options=AV_OPTIONS, timeout=AV_TIMEOUT, **kwargs)
+        stream = self.container.streams.video[0]
+        stream.thread_type = "AUTO"
+        self.frames = self.container.decode(stream)
+        self.frame = None
+        log.info("🎞️ PyAV Decode (%s)", "NVDEC" if hwaccel else "CPU")
+
+    def isOpened(self):
+        return self.container is not None
+
+    def set(self, prop, value):
+        return False # FFmpeg options are passed at open time instead
+
+    def grab(self):
+        # Decode only; the YUV -> BGR conversion waits for retrieve()
+        try:
+            self.frame = next(self.frames)
+            return True
+        except Exception:
+            self.frame = None
+            return False
+
+    def retrieve(self):
+        if self.frame is None: return False, None
+        return True, self.frame.to_ndarray(format="bgr24")
+
+    def read(self):
+        return self.retrieve() if self.grab() else (False, None)
+
+    def release(self):
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+
 # -----------------------------------------------------------------------
 # THREADED CAMERA CLASS (WITH FPS)
 # -----------------------------------------------------------------------
@@ -90,41 +338,57 @@ class ThreadedCamera:
     def __init__(self, src, name):
         self.src = int(src) if str(src).isdigit() else src
         self.name = name
-        self.stopped = False
-        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        # Latest-frame slot: the reader overwrites, the pipeline takes (no queue)
+        self._slot = None
+        self._slot_lock = threading.Lock()
+        self._slot_ready = threading.Event()
         
         # FPS Tracking
         self.fps = 0.0
         self._frames_since_last_check = 0
-        self._prev_time = time.time()
+        self._prev_time = time.monotonic()
+        self._last_retrieve = 0.0
+
+        # Adaptive Throttling (fed by the stream loop)
+        self.skip_factor = 1
+        self.process_ewma = 0.0
         
         # Initial Connection
         self.cap = self._open_camera()
         if self.cap:
              self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-             self.grabbed, self.frame = self.cap.read()
-        else:
-             self.grabbed = False
-             self.frame = None
-
-        self.last_read_time = time.time()
+             grabbed, frame = self.cap.read()
+             if grabbed: self._publish(frame)
 
         # Start Thread
-        self.t = threading.Thread(target=self.update, args=())
+        self.t = threading.Thread(target=self.update, name=f"reader-{name}", args=())
         self.t.daemon = True
         self.t.start()
 
+    @property
+    def stopped(self):
+        return self.stop_event.is_set()
+
     def _open_camera(self):
         if self.stopped: return None
         try:
             if isinstance(self.src, int):
-                print(f"🔌 Opening Local Camera {self.src}...")
+                log.info("🔌 Opening Local Camera %s...", self.src)
                 return cv2.VideoCapture(self.src)
             else:
-                print(f"🌐 Opening Network Stream...")
+                log.info("🌐 Opening Network Stream...")
+                if USE_PYAV:
+                    try:
+                        return AVCapture(self.src)
+                    except Exception as e:
+                        log.warning("⚠️ PyAV open failed, using OpenCV: %s", e)
+                if HW_DECODE:
+                    params = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+                    return cv2.VideoCapture(self.src, cv2.CAP_FFMPEG, params)
                 return cv2.VideoCapture(self.src, cv2.CAP_FFMPEG)
         except Exception as e:
-            print(f"❌ Cam Error: {e}")
+            log.error("❌ Cam Error: %s", e)
             return None
 
     def update(self):
@@ -134,21 +398,35 @@ class ThreadedCamera:
                 continue
 
             try:
-                grabbed, frame = self.cap.read()
+                if not self.cap.grab():
+                    self._reconnect()
+                    continue
+
+                # Calculate FPS (source rate, every grabbed frame)
+                self._frames_since_last_check += 1
+                now = time.monotonic()
+                elapsed = now - self._prev_time
+                if elapsed >= 1.0:
+                    self.fps = self._frames_since_last_check / elapsed
+                    self._frames_since_last_check = 0
+                    self._prev_time = now
+
+                # Only decode the frames the stream will actually emit
+                if now - self._last_retrieve < self.skip_factor / STREAM_FPS:
+                    continue
+
+                # BUFFERSIZE=1 is only a hint: a buffered frame grabs in well under
+                # 5 ms, a live one takes ~a frame interval, so stop at the first slow grab
+                for _ in range(MAX_DRAIN_GRABS):
+                    t = time.perf_counter()
+                    if not self.cap.grab(): break
+                    self._frames_since_last_check += 1
+                    if time.perf_counter() - t > 0.005: break
+
+                grabbed, frame = self.cap.retrieve()
                 if grabbed:
-                    with self.lock:
-                        self.grabbed = grabbed
-                        self.frame = frame
-                        self.last_read_time = time.time()
-                        
-                        # Calculate FPS
-                        self._frames_since_last_check += 1
-                        now = time.time()
-                        elapsed = now - self._prev_time
-                        if elapsed >= 1.0:
-                            self.fps = self._frames_since_last_check / elapsed
-                            self._frames_since_last_check = 0
-                            self._prev_time = now
+                    self._last_retrieve = now
+                    self._publish(frame)
                 else:
                     self._reconnect()
             except Exception:
@@ -156,6 +434,12 @@ class ThreadedCamera:
                 
             time.sleep(0.005)
 
+        # Released here, on the decode thread, so stop() never closes a capture
+        # while a grab()/retrieve() is still running on it
+        if self.cap:
+            self.cap.release()
+        log.info("✅ CAMERA HARDWARE RELEASED: %s", self.name)
+
     def _reconnect(self):
         if self.stopped: return
         self.fps = 0.0 # Reset FPS on disconnect
@@ -163,147 +447,478 @@ class ThreadedCamera:
         if self.cap:
             self.cap.release()
         
-        time.sleep(1)
+        if self.stop_event.wait(1): return # Wakes immediately on stop()
         
-        if self.stopped: return
-        
-        print(f"🔄 {self.name}: Reconnecting...")
+        log.info("🔄 %s: Reconnecting...", self.name)
         self.cap = self._open_camera()
         if self.cap:
             self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
-    def read(self):
-        with self.lock:
-            if self.stopped: return False, None
-            if time.time() - self.last_read_time > 3.0:
-                self.fps = 0.0 # Force 0 FPS if stale
-                return False, None
-            return self.grabbed, self.frame
+    def _downscale(self, frame):
+        # One shared buffer for inference, annotation and encode
+        h, w = frame.shape[:2]
+        if w <= STREAM_MAX_WIDTH: return frame
+        size = (STREAM_MAX_WIDTH, int(h * STREAM_MAX_WIDTH / w))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def _publish(self, frame):
+        # The motion thumbnail is made here, off the pipeline thread
+        frame = self._downscale(frame)
+        small = cv2.cvtColor(cv2.resize(frame, MOTION_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        self._put((frame, small))
+
+    def _put(self, item):
+        # Overwrites an untaken frame: intermediate frames are dropped, never queued
+        with self._slot_lock:
+            self._slot = item
+            self._slot_ready.set()
+
+    def report_latency(self, seconds):
+        # EWMA of per-frame processing time, doubles/halves skip_factor to match
+        self.process_ewma = seconds if self.process_ewma == 0.0 else 0.8 * self.process_ewma + 0.2 * seconds
+        interval = self.skip_factor / STREAM_FPS
+        if self.process_ewma > interval and self.skip_factor < MAX_SKIP_FACTOR:
+            self.skip_factor *= 2
+        elif self.process_ewma < interval / 2 and self.skip_factor > 1:
+            self.skip_factor //= 2
+
+    def read(self, timeout=STALE_TIMEOUT):
+        # -> (grabbed, frame, gray motion thumbnail)
+        if self.stopped: return False, None, None
+        if not self._slot_ready.wait(timeout):
+            self.fps = 0.0 # Force 0 FPS if stale
+            return False, None, None
+        with self._slot_lock:
+            item, self._slot = self._slot, None
+            self._slot_ready.clear()
+        if item is None: return False, None, None # Stop sentinel
+        return (True, *item)
 
     def stop(self):
-        self.stopped = True
+        self.stop_event.set()
+        self._put(None) # Wake a pipeline blocked in read()
         if self.t.is_alive():
+            # A blocked read ends within AV_TIMEOUT / the FFmpeg timeout; the
+            # thread then releases the capture itself
             self.t.join(timeout=1.0)
-        if self.cap:
-            self.cap.release()
-        print(f"✅ CAMERA HARDWARE RELEASED: {self.name}")
 
 # -----------------------------------------------------------------------
 # HELPER FUNCTIONS
 # -----------------------------------------------------------------------
-def save_detection_image(frame, cam_name):
+def put_latest(q, item):
+    # Non-blocking put that drops the oldest queued item(s) to make room
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try: q.get_nowait()
+            except queue.Empty: pass
+
+def write_file(path, data):
+    # Unbuffered: the JPEG is already one contiguous buffer, skip the file object
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+@dataclass
+class SaveJob:
+    path: str
+    data: bytes
+    done: threading.Event = field(default_factory=threading.Event)
+    ok: bool = False
+
+def capture_writer():
+    while True:
+        # Block for one write, then flush whatever else queued up meanwhile
+        batch = [save_queue.get()]
+        while True:
+            try: batch.append(save_queue.get_nowait())
+            except queue.Empty: break
+        for job in batch:
+            # Write beside the target and rename, so readers never see a partial file
+            temp_path = job.path + ".part"
+            try:
+                write_file(temp_path, job.data)
+                os.replace(temp_path, job.path)
+                job.ok = True
+            except Exception as e:
+                log.warning("⚠️ Save Error: %s", e)
+            finally:
+                job.done.set()
+
+def save_detection_image(image, cam_name):
+    # image: JPEG bytes, or an annotated frame to encode at CAPTURE_QUALITY.
+    # Returns the queued SaveJob, or None if nothing will be written.
     unique_id = uuid.uuid4().hex[:8]
     filename = f"{cam_name.replace(' ', '_')}_{unique_id}.jpg"
     path = os.path.join(CAPTURE_DIR, filename)
     try:
-        cv2.imwrite(path, frame)
-    except: pass
-    return filename
-
-def send_alert_async(cam_name, detected_class, conf, xyxy, frame):
-    def _send():
-        label_text = str(detected_class).lower().strip()
-        if "drone" not in label_text: return
+        if not isinstance(image, bytes):
+            image = encode_jpeg(image, quality=CAPTURE_QUALITY)
+        # Leave the disk write to capture_writer
+        job = SaveJob(path, image)
+        save_queue.put_nowait(job)
+    except (queue.Full, Exception) as e:
+        log.warning("⚠️ Save Error (%s): %s", filename, str(e) or "save queue full")
+        return None
+    return job
+
+threading.Thread(target=capture_writer, name="capture-writer", daemon=True).start()
+
+def annotate_alert(image, conf, xyxy):
+    # Runs past the cooldown only: decode the stream JPEG (or copy the shared
+    # frame) and mark the drone that raised the alert on top of the stream boxes
+    if isinstance(image, bytes):
+        frame = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
+    else:
+        frame = image.copy()
+    x1, y1, x2, y2 = map(int, xyxy)
+    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 3)
+    cv2.putText(frame, f"DRONE {conf:.2f}", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    return frame
 
-        current_time = time.time()
-        if cam_name in last_alert_time and (current_time - last_alert_time[cam_name] < 2): 
-            return
+def process_alert(cam_name, label_text, conf, xyxy, image):
+    log.info("🚨 ALERT: %s (%.2f)", label_text, conf)
 
-        print(f"🚨 ALERT: {label_text} ({conf:.2f})")
+    try:
+        job = save_detection_image(annotate_alert(image, conf, xyxy), cam_name)
+
+        payload = {
+            "cameraName": cam_name,
+            "detectedClass": "Drone",
+            "confidence": float(conf),
+        }
+        # Only reference the image once it is on disk; the frontend loads it right away
+        if job is not None and job.done.wait(SAVE_TIMEOUT) and job.ok:
+            payload["image"] = os.path.basename(job.path)
+        body = orjson.dumps(payload) if orjson else json.dumps(payload).encode()
+        ALERT_SESSION.post(NODE_API, data=body, headers=JSON_HEADERS, timeout=2)
+    except Exception as e:
+        log.warning("⚠️ Alert Error: %s", e)
+
+def alert_worker():
+    while True:
+        process_alert(*alert_queue.get())
+
+def send_alert_async(cam_name, conf, xyxy, image):
+    # Drone detections only: the pipeline's DRONE_CLASS_ID mask is the gate
+    state = camera_states.get(cam_name)
+    if state is None: return
+
+    # Check + claim the cooldown atomically
+    current_time = time.monotonic()
+    with state.lock:
+        if current_time - state.last_alert < ALERT_COOLDOWN: return
+        state.last_alert = current_time
+
+    # Workers backed up: shed the oldest queued alert, the newest snapshot matters most
+    put_latest(alert_queue, (cam_name, CLASS_NAMES[DRONE_CLASS_ID], conf, xyxy, image))
+
+# Fixed pool of long-lived workers instead of a thread per detection
+for i in range(ALERT_WORKERS):
+    threading.Thread(target=alert_worker, name=f"alert-{i}", daemon=True).start()
+
+# Shared "nothing found" result: (detections, class_names, labels, boxes)
+EMPTY_RESULT = (sv.Detections.empty(), [], [], [])
+
+@dataclass
+class InferenceJob:
+    frame: np.ndarray
+    coarse: bool = False
+    done: threading.Event = field(default_factory=threading.Event)
+    result: tuple = EMPTY_RESULT
+
+def to_result(r):
+    # Row count is known on the host: empty frames never copy anything back
+    if len(r.boxes) == 0: return EMPTY_RESULT
+    # One device->host copy of the N x 6 (x1, y1, x2, y2, conf, cls) block,
+    # instead of a separate .cpu() per field in Detections.from_ultralytics
+    data = r.boxes.data.cpu().numpy()
+    detections = sv.Detections(
+        xyxy=data[:, :4], confidence=data[:, 4], class_id=data[:, 5].astype(int),
+    )
+    class_names = CLASS_NAME_TABLE[detections.class_id]
+    labels = np.char.add(class_names.astype(str), np.char.mod(" %.2f", detections.confidence))
+    # Closed int32 quads (x1,y1)(x2,y1)(x2,y2)(x1,y2), ready for cv2.polylines on every redraw
+    boxes = detections.xyxy.astype(np.int32)[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+    return detections, class_names, labels, boxes
+
+def run_inference_batch(frames, coarse=False):
+    # BGR ndarrays go in as-is: Ultralytics flips channels inside the same copy
+    # that builds the NCHW batch, so BGR-ordered conv weights would save nothing
+    global USE_COARSE_PASS
+    try:
+        results = model.predict(frames, **(COARSE_PREDICT_KWARGS if coarse else PREDICT_KWARGS))
+        return [to_result(r) for r in results]
+    except Exception as e:
+        if coarse:
+            log.warning("⚠️ Coarse pass unavailable, heartbeats run at full size: %s", e)
+            USE_COARSE_PASS = False
+        else:
+            log.warning("⚠️ Inference Error: %s", e)
+        return [EMPTY_RESULT] * len(frames)
+
+def inference_worker():
+    # Sole caller of model.predict: drains whatever cameras are waiting
+    # (up to INFER_BATCH_SIZE) and runs them as one batch
+    while True:
+        jobs = [infer_queue.get()]
+        # Each open stream has at most one job in flight, so stop waiting
+        # as soon as every active camera is in the batch
+        expected = min(INFER_BATCH_SIZE, max(1, sum(1 for st in list(camera_states.values()) if st.reader)))
+        deadline = time.perf_counter() + INFER_BATCH_WAIT
+        while len(jobs) < expected:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0: break
+            try: jobs.append(infer_queue.get(timeout=remaining))
+            except queue.Empty: break
+
+        # One predict per input size (coarse heartbeats vs full passes)
+        for coarse in (False, True):
+            group = [job for job in jobs if job.coarse is coarse]
+            if not group: continue
+            for job, result in zip(group, run_inference_batch([job.frame for job in group], coarse)):
+                job.result = result
+                job.done.set()
+
+def run_inference(frame, coarse=False):
+    if model is None: return EMPTY_RESULT
+    job = InferenceJob(frame, coarse)
+    infer_queue.put(job)
+    if not job.done.wait(INFER_TIMEOUT): return EMPTY_RESULT
+    return job.result
+
+def warm_up_model():
+    # Predictor setup, TensorRT context creation and cuDNN autotuning happen at
+    # import instead of on the first /stream; also settles USE_COARSE_PASS early
+    warmup = np.zeros((IMG_SIZE, IMG_SIZE, 3), np.uint8)
+    run_inference_batch([warmup])
+    run_inference_batch([warmup], coarse=True)
+    log.info("🔥 Model warmed up")
+
+if model is not None:
+    # Before the batcher starts: it is the only other caller of model.predict
+    warm_up_model()
+    threading.Thread(target=inference_worker, name="inference-batcher", daemon=True).start()
+
+# Label Glyphs: each character rasterised once, then blitted as a mask
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_SCALE = 0.6
+LABEL_COLOR = (0, 0, 255)
+(_, LABEL_ASCENT), LABEL_DESCENT = cv2.getTextSize("bdgy0", LABEL_FONT, LABEL_SCALE, 1)
+GLYPH_CACHE = {}
+LABEL_CACHE = {} # Whole-label masks; "<class> 0.xx" keeps this to a few hundred entries
+
+def get_glyph(ch):
+    mask = GLYPH_CACHE.get(ch)
+    if mask is None:
+        (w, _), _ = cv2.getTextSize(ch, LABEL_FONT, LABEL_SCALE, 1)
+        canvas = np.zeros((LABEL_ASCENT + LABEL_DESCENT, max(w, 1)), np.uint8)
+        cv2.putText(canvas, ch, (0, LABEL_ASCENT), LABEL_FONT, LABEL_SCALE, 255, 1)
+        mask = GLYPH_CACHE[ch] = canvas > 0
+    return mask
+
+def get_label_mask(text):
+    mask = LABEL_CACHE.get(text)
+    if mask is None:
+        mask = LABEL_CACHE[text] = np.hstack([get_glyph(ch) for ch in text])
+    return mask
+
+def draw_label(frame, text, x, y):
+    # (x, y) is the baseline origin, same as cv2.putText. One masked blit per label.
+    mask = get_label_mask(text)
+    top = y - LABEL_ASCENT
+    gh, gw = mask.shape
+    fh, fw = frame.shape[:2]
+    x0, y0, x1, y1 = max(x, 0), max(top, 0), min(x + gw, fw), min(top + gh, fh)
+    if x0 < x1 and y0 < y1:
+        frame[y0:y1, x0:x1][mask[y0 - top:y1 - top, x0 - x:x1 - x]] = LABEL_COLOR
+
+def draw_detections(frame, boxes, labels):
+    # Every outline in one cv2.polylines call; labels still need a blit each
+    cv2.polylines(frame, boxes, True, LABEL_COLOR, 2)
+    for (x1, y1), label in zip(boxes[:, 0].tolist(), labels):
+        draw_label(frame, label, x1, y1 - 6)
+    return frame
 
+def encode_jpeg(frame, quality=JPEG_QUALITY):
+    global USE_NVJPEG
+    if USE_NVJPEG:
         try:
-            x1, y1, x2, y2 = map(int, xyxy)
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 3)
-            label = f"DRONE {conf:.2f}"
-            cv2.putText(frame, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            image_filename = save_detection_image(frame, cam_name)
-            
-            payload = {
-                "cameraName": cam_name,
-                "detectedClass": "Drone",
-                "confidence": float(conf),
-                "image": image_filename
-            }
-            requests.post(NODE_API, json=payload, timeout=2)
-            last_alert_time[cam_name] = current_time
+            # BGR HWC -> RGB CHW on the device, only the JPEG bytes come back
+            t = torch.from_numpy(frame).to("cuda", non_blocking=True).flip(-1).permute(2, 0, 1).contiguous()
+            return nvjpeg_encode(t, quality=quality).cpu().numpy().tobytes()
         except Exception as e:
-            print(f"⚠️ Alert Error: {e}")
-
-    threading.Thread(target=_send, daemon=True).start()
-
-def run_inference(frame):
-    if model is None: return sv.Detections.empty(), []
-    try:
-        results = model.predict(frame, conf=CONFIDENCE, iou=IOU_THRESH, agnostic_nms=True, verbose=False, device=DEVICE)
-        if not results: return sv.Detections.empty(), []
-        r = results[0]
-        detections = sv.Detections.from_ultralytics(r)
-        class_names = [CLASS_NAMES.get(class_id, str(class_id)) for class_id in detections.class_id]
-        return detections, class_names
-    except:
-        return sv.Detections.empty(), []
-
-def get_reconnecting_frame():
-    frame = np.zeros((480, 640, 3), dtype=np.uint8)
-    cv2.putText(frame, "SIGNAL LOST", (200, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-    return frame
+            log.warning("⚠️ nvJPEG unavailable, using CPU encoder: %s", e)
+            USE_NVJPEG = False
+
+    # libjpeg-turbo straight from the BGR buffer, cv2 as fallback
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(frame, quality=quality, colorspace="BGR", fastdct=True)
+    ret, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes() if ret else None
+
+def encode_ppm(frame):
+    # Uncompressed P6 for LAN viewers (?raw=1): no DCT/Huffman at all
+    h, w = frame.shape[:2]
+    # join() reads the RGB array through the buffer protocol: one copy, no tobytes()
+    return b"".join((b"P6\n%d %d\n255\n" % (w, h), cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+
+# Static frame: rendered + encoded once at import, reused for every stall tick
+SIGNAL_LOST_FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+cv2.putText(SIGNAL_LOST_FRAME, "SIGNAL LOST", (200, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+SIGNAL_LOST_ITEM = (SIGNAL_LOST_FRAME, encode_jpeg(SIGNAL_LOST_FRAME, quality=60))
+SIGNAL_LOST_FRAME.setflags(write=False) # After encoding: nvJPEG wraps it with torch.from_numpy
 
 # -----------------------------------------------------------------------
-# STREAM GENERATOR
+# CAMERA PIPELINE (one per camera, shared by all its viewers)
 # -----------------------------------------------------------------------
-def generate_frames(source: str, cam_name: str, session_id: str):
-    active_streams[cam_name] = True
-    print(f"📷 STREAM REQUEST: {cam_name}")
-
-    with reader_lock:
-        if cam_name not in stream_readers or stream_readers[cam_name].stopped:
-            stream_readers[cam_name] = ThreadedCamera(source, cam_name)
-
-    camera = stream_readers[cam_name]
-    
-    box_annotator = sv.BoxAnnotator(thickness=2)
-    label_annotator = sv.LabelAnnotator(text_scale=0.5, text_thickness=1)
+def subscribe(state, raw=False):
+    # None if the camera is already shutting down; the caller starts a fresh one
+    session = queue.Queue(maxsize=1)
+    with state.lock:
+        if state.stop_event.is_set(): return None
+        state.subscribers.append((session, raw))
+        if state.pipeline is None:
+            state.pipeline = threading.Thread(target=camera_pipeline, name=f"pipeline-{state.name}", args=(state,), daemon=True)
+            state.pipeline.start()
+    return session
+
+def join_camera(cam_name, source, raw=False):
+    while True:
+        with camera_states_lock:
+            state = camera_states.get(cam_name)
+            if state is None or state.stop_event.is_set():
+                # Alert cooldown survives the restart
+                state = camera_states[cam_name] = CameraState(
+                    cam_name, source, last_alert=state.last_alert if state else float("-inf"),
+                )
+        session = subscribe(state, raw)
+        if session is not None: return state, session
+
+def unsubscribe(state, session, raw=False):
+    with state.lock:
+        state.subscribers.remove((session, raw))
+        if state.subscribers: return
+        state.stop_event.set() # Under the lock so no session can join a dying camera
+    shutdown_camera(state)
+
+def shutdown_camera(state):
+    # Last viewer left (or /terminate): release the reader, end every session
+    state.stop_event.set()
+    with state.lock:
+        reader, state.reader = state.reader, None
+        sessions = list(state.subscribers)
+    if reader: reader.stop()
+    for session, _ in sessions:
+        put_latest(session, None)
+
+def broadcast(state, item):
+    for session, _ in list(state.subscribers): # GIL-atomic snapshot, no lock
+        put_latest(session, item)
+
+def camera_pipeline(state):
+    # Decode, inference, annotation and JPEG encode happen once per camera;
+    # viewers receive (annotated frame, JPEG bytes or None) through their own queue
+    camera = ThreadedCamera(state.source, state.name)
+    with state.lock:
+        stopped = state.stop_event.is_set()
+        if not stopped: state.reader = camera
+    if stopped:
+        camera.stop()
+        return
+
+    # Motion gate state: thumbnail of the last inferred frame + its result
+    infer_small = None
+    infer_result = EMPTY_RESULT
+    last_infer = 0.0
 
     try:
-        while True:
-            if camera_sessions.get(cam_name) != session_id: break
-            if not active_streams.get(cam_name, False): break
-
-            grabbed, frame = camera.read()
+        while not state.stop_event.is_set():
+            grabbed, frame, small = camera.read()
 
             if not grabbed or frame is None:
-                fail_frame = get_reconnecting_frame()
-                ret, buffer = cv2.imencode(".jpg", fail_frame)
-                yield (b"--frame\r\n" b"Content-Type: image/jpeg\r\n\r\n" + buffer.tobytes() + b"\r\n")
-                time.sleep(0.5)
+                broadcast(state, SIGNAL_LOST_ITEM)
+                state.stop_event.wait(0.5)
                 continue
 
-            # MAX PERFORMANCE INFERENCE
-            local_detections, local_names = run_inference(frame)
+            started = time.perf_counter()
+
+            # Cheap SAD on the thumbnail decides whether YOLO needs to run at all.
+            # Never skip while something is on screen: boxes must follow it.
+            moved = infer_small is None or cv2.norm(small, infer_small, cv2.NORM_L1) / small.size >= MOTION_THRESH
+            full = moved or len(infer_result[0]) > 0
+            if full or started - last_infer >= MOTION_MAX_SKIP:
+                # Quiet-scene heartbeat: a coarse low-threshold look first, and the
+                # full-size pass on this same frame only if it finds a candidate
+                if not full:
+                    full = not USE_COARSE_PASS or len(run_inference(frame, coarse=True)[0]) > 0
+                infer_result = run_inference(frame) if full else EMPTY_RESULT
+                infer_small = small
+                last_infer = started
+
+            local_detections, local_names, local_labels, local_boxes = infer_result
             
             if len(local_detections) > 0:
-                for name, conf, xyxy in zip(local_names, local_detections.confidence, local_detections.xyxy):
-                    send_alert_async(cam_name, name, conf, xyxy, frame.copy())
-                
-                frame = box_annotator.annotate(scene=frame, detections=local_detections)
-                labels = [f"{name} {conf:.2f}" for name, conf in zip(local_names, local_detections.confidence)]
-                frame = label_annotator.annotate(scene=frame, detections=local_detections, labels=labels)
+                frame = draw_detections(frame, local_boxes, local_labels)
+
+            # Raw-only audiences skip JPEG; an alert then encodes its own snapshot
+            wants_jpeg = any(not raw for _, raw in list(state.subscribers))
+            buffer = encode_jpeg(frame) if wants_jpeg else None
+            camera.report_latency(time.perf_counter() - started)
+
+            # The cooldown admits at most one alert per frame, so only the most
+            # confident drone is offered instead of one call per detection
+            drone_mask = local_detections.class_id == DRONE_CLASS_ID
+            if drone_mask.any():
+                # Hand over the streamed JPEG (or the frame, which is not touched again
+                # after this iteration) plus the box; annotation waits for the cooldown
+                drone_conf = local_detections.confidence[drone_mask]
+                best = drone_conf.argmax()
+                snapshot = buffer if buffer is not None else frame
+                send_alert_async(state.name, drone_conf[best], local_detections.xyxy[drone_mask][best], snapshot)
+
+            broadcast(state, (frame, buffer))
 
-            ret, buffer = cv2.imencode(".jpg", frame)
-            if not ret: continue
-            yield (b"--frame\r\n" b"Content-Type: image/jpeg\r\n\r\n" + buffer.tobytes() + b"\r\n")
-            
-            time.sleep(0.01)
+    except Exception as e:
+        log.error("❌ Pipeline Error: %s", e)
+    finally:
+        shutdown_camera(state)
+
+# -----------------------------------------------------------------------
+# STREAM GENERATOR
+# -----------------------------------------------------------------------
+def generate_frames(cam_name: str, source: str, raw: bool = False):
+    log.info("📷 STREAM REQUEST: %s", cam_name)
+    # Subscribing here, not in the route, so the finally below always pairs with it
+    state, session = join_camera(cam_name, source, raw)
+    part_header = PPM_HEADER if raw else MJPEG_HEADER
+
+    try:
+        while True:
+            try:
+                item = session.get(timeout=STALE_TIMEOUT)
+            except queue.Empty:
+                if state.stop_event.is_set(): break
+                continue
+            if item is None: break # Camera shut down
+
+            frame, jpeg = item
+            # JPEG is encoded once for all viewers; raw (PPM) viewers pack their own
+            buffer = encode_ppm(frame) if raw else jpeg
+            if buffer is None: continue
+            # One allocation for the whole part (a + b + c builds an extra temporary)
+            yield b"".join((part_header, buffer, b"\r\n"))
 
     except Exception as e:
-        print(f"❌ Gen Error: {e}")
+        log.error("❌ Gen Error: %s", e)
     finally:
-        if camera_sessions.get(cam_name) == session_id:
-            active_streams[cam_name] = False
-            with reader_lock:
-                reader = stream_readers.pop(cam_name, None)
-                if reader: reader.stop()
+        unsubscribe(state, session, raw)
 
 # -----------------------------------------------------------------------
 # FASTAPI ROUTES
@@ -313,20 +928,17 @@ def generate_frames(source: str, cam_name: str, session_id: str):
 async def terminate_stream(req: TerminateRequest):
     cam_name = req.cameraName
     if cam_name:
-        print(f"🛑 TERMINATE SIGNAL: {cam_name}")
-        active_streams[cam_name] = False
-        with reader_lock:
-            reader = stream_readers.pop(cam_name, None)
-            if reader: reader.stop()
+        log.info("🛑 TERMINATE SIGNAL: %s", cam_name)
+        state = camera_states.get(cam_name)
+        if state: shutdown_camera(state) # Ends every viewer of this camera
         return {"message": "Terminating"}
     return JSONResponse(status_code=404, content={"message": "Not found"})
 
 @app.get("/stream")
-async def stream(url: str = Query(...), name: str = Query("Unknown")):
-    new_session_id = uuid.uuid4().hex
-    camera_sessions[name] = new_session_id
+async def stream(url: str = Query(...), name: str = Query("Unknown"), raw: bool = Query(False)):
+    # Viewers of the same camera share one reader; see join_camera()
     return StreamingResponse(
-        generate_frames(url, name, new_session_id), 
+        generate_frames(name, url, raw), 
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
@@ -335,14 +947,31 @@ async def stream(url: str = Query(...), name: str = Query("Unknown")):
 async def get_fps():
     """Returns the current processing FPS for all active cameras."""
     fps_data = {}
-    with reader_lock:
-        for name, reader in stream_readers.items():
-            if not reader.stopped:
-                fps_data[name] = round(reader.fps, 1)
+    for name, state in list(camera_states.items()): # GIL-atomic snapshot, no lock
+        reader = state.reader
+        if reader and not reader.stopped:
+            fps_data[name] = round(reader.fps, 1)
     return fps_data
 
+@app.get("/metrics")
+async def get_metrics():
+    """Returns FPS, adaptive skip factor and per-frame processing time per camera."""
+    metrics = {}
+    for name, state in list(camera_states.items()):
+        reader = state.reader
+        if reader and not reader.stopped:
+            metrics[name] = {
+                "fps": round(reader.fps, 1),
+                "skipFactor": reader.skip_factor,
+                "processMs": round(reader.process_ewma * 1000, 1),
+            }
+    return metrics
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=5000)
+    # loop/http "auto" already pick uvloop + httptools when installed. Single
+    # process on purpose: readers, sessions and the model live in memory.
+    # No access log: the dashboard polls /fps every second.
+    uvicorn.run(app, host="0.0.0.0", port=5000, loop="auto", http="auto", workers=1, access_log=False, log_level="warning")
 
 # import os
 # import cv2
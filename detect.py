@@ -1,16 +1,42 @@
+import os
 import cv2
+import numpy as np
 from ultralytics import YOLO
 import time
+import torch
+from scripts.engine_export import export_engine
 
 # -----------------------------------------------------------------------
 # CONFIGURATION
 # -----------------------------------------------------------------------
 MODEL_PATH = "best_latest.pt"       # Ensure this is in the same folder
+ENGINE_PATH = "best_latest_b1.engine"  # TensorRT FP16 batch-1, separate from the backend's dynamic engine
+USE_TENSORRT = True
+IMG_SIZE = 640
 CONFIDENCE = 0.35            # Slightly higher to reduce ghost detections
 IOU_THRESHOLD = 0.4          # NMS Threshold
 SWAP_CLASSES = True          # Fix Bird/Drone swap
+
+# Fixed input size: let cuDNN autotune once, and allow TF32 for any FP32 math
+torch.backends.cudnn.benchmark = True
+torch.backends.cuda.matmul.allow_tf32 = True
+torch.backends.cudnn.allow_tf32 = True
+torch.set_float32_matmul_precision("high")
 # -----------------------------------------------------------------------
 
+def load_tensorrt_engine(model):
+    # Exported once (after the class swap, so the engine metadata carries it)
+    try:
+        if not os.path.exists(ENGINE_PATH):
+            print("⚙️ Building TensorRT engine (first run only)...")
+            export_engine(MODEL_PATH, ENGINE_PATH, model.model.names, imgsz=IMG_SIZE, half=True, device=0)
+        engine = YOLO(ENGINE_PATH, task="detect")
+        print(f"⚡ TensorRT engine loaded: {ENGINE_PATH}")
+        return engine
+    except Exception as e:
+        print(f"⚠️ TensorRT unavailable, using PyTorch: {e}")
+        return model
+
 def run_inference():
     # 1. Load Model
     print("⏳ Loading model...")
@@ -26,6 +52,13 @@ def run_inference():
         model.model.names = {0: 'bird', 1: 'drone'}
         print(f"🔄 Classes swapped: {model.model.names}")
 
+    if USE_TENSORRT and torch.cuda.is_available():
+        model = load_tensorrt_engine(model)
+
+    # Warm up before the webcam opens: predictor setup and first-call kernel
+    # tuning would otherwise land on the first live frame
+    model.predict(np.zeros((IMG_SIZE, IMG_SIZE, 3), np.uint8), verbose=False)
+
     # 3. Initialize Webcam (The Fix for Windows Error -2147483638)
     # We try index 0 first, then 1 (common if you have a virtual cam or IR cam)
     cap = None
@@ -1,20 +1,139 @@
+import os
+import argparse
 import cv2
+import numpy as np
 from ultralytics import YOLO
+from ultralytics.engine.results import Results
+from ultralytics.utils import ops
 import time
 import torch
+import torch.nn.functional as F
+from scripts.engine_export import export_engine
 
 # -----------------------------------------------------------------------
 # CONFIGURATION
 # -----------------------------------------------------------------------
 MODEL_PATH = "best_latest.pt"       # Ensure this is in the same folder
+ENGINE_PATH = "best_latest_b1.engine"  # TensorRT FP16 batch-1, separate from the backend's dynamic engine
+INT8_ENGINE_PATH = "best_latest_int8.engine"  # Built by scripts/build_int8_engine.py
+USE_TENSORRT = True
 CONFIDENCE = 0.35                   # Slightly higher to reduce ghost detections
 IOU_THRESHOLD = 0.4                 # NMS Threshold
 SWAP_CLASSES = True                 # Fix Bird/Drone swap
+IMG_SIZE = 640                      # Fixed letterbox size, so the forward pass can be graphed
 
 DEVICE = 0 if torch.cuda.is_available() else "cpu"
+USE_CUDA_GRAPH = DEVICE != "cpu"    # PyTorch fallback only: replay one captured graph per frame
+
+# Fixed input size: let cuDNN autotune once, and allow TF32 for any FP32 math
+torch.backends.cudnn.benchmark = True
+torch.backends.cuda.matmul.allow_tf32 = True
+torch.backends.cudnn.allow_tf32 = True
+torch.set_float32_matmul_precision("high")
 # -----------------------------------------------------------------------
 
-def run_inference():
+def load_tensorrt_engine(model, precision="int8"):
+    # INT8 needs a calibration set, so it is built offline; FP16 is exported
+    # here once (after the class swap, so the engine metadata carries it)
+    try:
+        engine_path = ENGINE_PATH
+        if precision == "int8":
+            if os.path.exists(INT8_ENGINE_PATH):
+                engine_path = INT8_ENGINE_PATH
+            else:
+                print("INT8 engine not built (run scripts/build_int8_engine.py), using FP16")
+        if not os.path.exists(engine_path):
+            print("Building TensorRT engine (first run only)...")
+            export_engine(MODEL_PATH, ENGINE_PATH, model.model.names, imgsz=IMG_SIZE, half=True, device=0)
+        engine = YOLO(engine_path, task="detect")
+        print(f"TensorRT engine loaded: {engine_path}")
+        return engine
+    except Exception as e:
+        print(f"TensorRT unavailable, using PyTorch: {e}")
+        return model
+
+class GraphedDetector:
+    """YOLO preprocessing + forward pass captured once as a CUDA graph, replayed per frame.
+
+    The raw BGR frame is uploaded as-is; letterbox resize and pad, BGR->RGB,
+    HWC->CHW and normalisation all run inside the graph, so the host does a
+    single memcpy per frame. Only NMS stays outside. The graph is recaptured
+    if the camera's frame size changes.
+    """
+
+    def __init__(self, model, frame_shape, img_size=IMG_SIZE):
+        self.names = model.names
+        self.img_size = img_size
+        # FP16 NHWC: the layout Ampere+ tensor-core conv kernels run natively
+        self.net = model.model.fuse().half().eval().to(memory_format=torch.channels_last)
+        self._capture(frame_shape)
+
+    def _capture(self, frame_shape):
+        # Same geometry as Ultralytics' LetterBox(auto=False), so scale_boxes maps back exactly
+        h, w = frame_shape[:2]
+        gain = min(self.img_size / h, self.img_size / w)
+        new_h, new_w = round(h * gain), round(w * gain)
+        dh, dw = (self.img_size - new_h) / 2, (self.img_size - new_w) / 2
+        self.resize_to = (new_h, new_w)
+        self.pad = (round(dw - 0.1), round(dw + 0.1), round(dh - 0.1), round(dh + 0.1))
+
+        self.shape = tuple(frame_shape)
+        self.static_in = torch.zeros(self.shape, dtype=torch.uint8, device="cuda")
+        # Pinned staging buffer, filled in place every frame: no per-frame
+        # allocation and the upload is a real async DMA
+        self.host_in = torch.empty(self.shape, dtype=torch.uint8, pin_memory=True)
+        self.host_view = self.host_in.numpy()
+
+        with torch.no_grad():
+            # Warm up on a side stream (cuDNN autotune, lazy allocations) before capture
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    self._forward()
+            torch.cuda.current_stream().wait_stream(stream)
+
+            self.graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(self.graph):
+                self.static_out = self._forward()
+
+    def _forward(self):
+        x = self.static_in.permute(2, 0, 1)[None].flip(1).half() / 255  # BGR HWC -> RGB NCHW
+        x = F.interpolate(x, size=self.resize_to, mode="bilinear", align_corners=False)
+        x = F.pad(x, self.pad, value=114 / 255)
+        return self.net(x.contiguous(memory_format=torch.channels_last))
+
+    def __call__(self, frame):
+        if frame.shape != self.shape:
+            self._capture(frame.shape)
+        np.copyto(self.host_view, frame)
+        self.static_in.copy_(self.host_in, non_blocking=True)
+        self.graph.replay()
+
+        pred = ops.non_max_suppression(
+            self.static_out, CONFIDENCE, IOU_THRESHOLD, agnostic=True
+        )[0]
+        pred[:, :4] = ops.scale_boxes((self.img_size, self.img_size), pred[:, :4], frame.shape)
+        return Results(frame, path="", names=self.names, boxes=pred)
+
+def compile_predict_model(model, frame_shape):
+    # Eager predict fallback: compile the predictor's network after its first
+    # call (predict fuses the module then, which would drop an earlier compile).
+    # Warm up at the webcam's size so the compiled graph matches live frames.
+    warmup = np.zeros(frame_shape, np.uint8)
+    model.predict(warmup, verbose=False, device=DEVICE)
+    backend = model.predictor.model
+    network = backend.model
+    try:
+        backend.model = torch.compile(network, mode="reduce-overhead", fullgraph=False, dynamic=False)
+        for _ in range(2):
+            model.predict(warmup, verbose=False, device=DEVICE)
+        print("torch.compile enabled")
+    except Exception as e:
+        backend.model = network
+        print(f"torch.compile unavailable, using eager predict: {e}")
+
+def run_inference(precision="int8"):
     print("Using device:", DEVICE)
 
     # 1. Load Model
@@ -34,7 +153,15 @@ def run_inference():
         model.model.names = {0: "bird", 1: "drone"}
         print(f"Classes swapped: {model.model.names}")
 
-    # 3. Initialize Webcam
+    # 3. Switch to the TensorRT engine (after the swap so results carry the right names)
+    if DEVICE != "cpu" and USE_TENSORRT:
+        model = load_tensorrt_engine(model, precision)
+        if not isinstance(model.model, torch.nn.Module):
+            # Engine context creation happens on first predict; do it before the
+            # webcam opens (the PyTorch path warms up during graph capture)
+            model.predict(np.zeros((IMG_SIZE, IMG_SIZE, 3), np.uint8), verbose=False, device=DEVICE)
+
+    # 4. Initialize Webcam
     cap = None
     for index in [0, 1]:
         print(f"Trying to open camera index {index} with DirectShow...")
@@ -51,13 +178,24 @@ def run_inference():
         print("Could not open any webcam. Check if another app is using it.")
         return
 
-    # 4. Set Resolution
+    # 5. Set Resolution
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
 
+    # 6. Capture the CUDA graph for the PyTorch model at the camera's frame size
+    detector = None
+    if USE_CUDA_GRAPH and isinstance(model.model, torch.nn.Module):
+        frame_shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 3)
+        try:
+            detector = GraphedDetector(model, frame_shape)
+            print("CUDA graph captured")
+        except Exception as e:
+            print(f"CUDA graph unavailable, using predict: {e}")
+            compile_predict_model(model, frame_shape)
+
     print("\nInference Started. Press Q to quit.")
 
-    # 5. Inference Loop
+    # 7. Inference Loop
     prev_time = 0
     while True:
         success, frame = cap.read()
@@ -72,17 +210,20 @@ def run_inference():
         prev_time = curr_time
 
         # Run YOLO Inference
-        results = model.predict(
-            frame,
-            conf=CONFIDENCE,
-            iou=IOU_THRESHOLD,
-            agnostic_nms=True,
-            verbose=False,
-            device=DEVICE,
-        )
+        if detector is not None:
+            result = detector(frame)
+        else:
+            result = model.predict(
+                frame,
+                conf=CONFIDENCE,
+                iou=IOU_THRESHOLD,
+                agnostic_nms=True,
+                verbose=False,
+                device=DEVICE,
+            )[0]
 
         # Plot Results
-        annotated_frame = results[0].plot(line_width=2, font_size=2)
+        annotated_frame = result.plot(line_width=2, font_size=2)
 
         # Draw FPS on screen
         cv2.putText(
@@ -106,4 +247,9 @@ def run_inference():
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    run_inference()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--precision", choices=["int8", "fp16"], default="int8",
+        help="TensorRT engine to run; fp16 is kept for regression checks",
+    )
+    run_inference(parser.parse_args().precision)
@@ -0,0 +1,57 @@
+import os
+import argparse
+from ultralytics import YOLO
+from engine_export import export_engine
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(ROOT_DIR, "best_latest.pt")
+ENGINE_PATH = os.path.join(ROOT_DIR, "best_latest_int8.engine")
+CAPTURE_DIR = os.path.join(ROOT_DIR, "backend", "public", "captures")
+CALIB_IMAGES = 500                  # Most recent alert captures used for calibration
+IMG_SIZE = 640
+BATCH = 8                           # INT8 only pays off batched; dynamic, so batch 1 still runs
+SWAP_CLASSES = True                 # Fix Bird/Drone swap (baked into the engine metadata)
+# -----------------------------------------------------------------------
+
+def write_calibration_yaml(capture_dir, max_images, out_dir, names):
+    # Ultralytics calibrates on the dataset's val split; alert captures are
+    # the closest thing we have to representative drone/bird frames
+    captures = [os.path.join(capture_dir, f) for f in os.listdir(capture_dir) if f.endswith(".jpg")]
+    captures.sort(key=os.path.getmtime, reverse=True)
+    captures = captures[:max_images]
+    if not captures:
+        raise SystemExit(f"No calibration frames found in {capture_dir}")
+
+    list_path = os.path.join(out_dir, "calib.txt")
+    with open(list_path, "w") as f:
+        f.write("\n".join(captures))
+
+    yaml_path = os.path.join(out_dir, "calib.yaml")
+    with open(yaml_path, "w") as f:
+        f.write(f"train: {list_path}\nval: {list_path}\nnames:\n")
+        f.writelines(f"  {i}: {name}\n" for i, name in names.items())
+    print(f"Calibration set: {len(captures)} frames from {capture_dir}")
+    return yaml_path
+
+def build_engine(args):
+    # Named after the output, so a FP16 best_latest.engine next to it is never touched
+    names = {0: "bird", 1: "drone"} if SWAP_CLASSES else YOLO(args.model).names
+    data = write_calibration_yaml(args.captures, args.images, os.path.dirname(args.output), names)
+    print("Building INT8 TensorRT engine...")
+    export_engine(
+        args.model, args.output, names, int8=True, data=data, imgsz=IMG_SIZE,
+        dynamic=True, batch=args.batch, workspace=4, device=0,
+    )
+    print(f"INT8 engine written: {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the INT8 TensorRT engine from alert captures.")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--captures", default=CAPTURE_DIR)
+    parser.add_argument("--images", type=int, default=CALIB_IMAGES)
+    parser.add_argument("--batch", type=int, default=BATCH)
+    parser.add_argument("--output", default=ENGINE_PATH)
+    build_engine(parser.parse_args())
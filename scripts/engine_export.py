@@ -0,0 +1,26 @@
+import os
+import shutil
+from ultralytics import YOLO
+
+def export_engine(model_path, output, names, **export_kwargs):
+    # Export names the engine after the weights, so export from a copy named
+    # after the output: other engines built from the same weights are never touched
+    weights = os.path.splitext(output)[0] + ".pt"
+    copied = os.path.abspath(weights) != os.path.abspath(model_path)
+    if copied:
+        shutil.copyfile(model_path, weights)
+
+    try:
+        model = YOLO(weights)
+        model.model.names = names # Class swap is baked into the engine metadata
+        exported = model.export(format="engine", **export_kwargs)
+        if os.path.abspath(exported) != os.path.abspath(output):
+            os.replace(exported, output)
+    finally:
+        if copied:
+            os.remove(weights)
+        # The ONNX intermediate is only needed while TensorRT builds
+        onnx_path = os.path.splitext(weights)[0] + ".onnx"
+        if os.path.exists(onnx_path):
+            os.remove(onnx_path)
+    return output